@@ -0,0 +1,189 @@
+import array
+import os
+import tempfile
+
+import pdqpq
+import puzz
+
+GOAL_STATE = puzz.EightPuzzleBoard("012345678")
+GOAL_STR = str(GOAL_STATE)
+GOAL_POS = {c: (i // 3, i % 3) for i, c in enumerate(GOAL_STR)}  # tile -> (row, col) in goal
+
+GOAL_PACKED = GOAL_STATE.packed
+GOAL_BLANK_SHIFT = 4 * GOAL_STR.index(puzz.BLANK_CHAR)
+NIBBLE_LOW_BITS = 0x111111111  # lowest bit of each of the nine 4-bit tile slots
+
+# MD[tile * 9 + pos] is the distance from string position pos to the tile's goal position (the
+# blank's row is all zeros so it never contributes); WEIGHTED_MD scales each row by the cost of
+# moving the tile, which goes past 255 and so does not fit in bytes
+MD = bytes(0 if t == 0 else abs(pos // 3 - GOAL_POS[str(t)][0]) + abs(pos % 3 - GOAL_POS[str(t)][1])
+           for t in range(9) for pos in range(9))
+WEIGHTED_MD = tuple(t**2 * d for t in range(9) for d in MD[t * 9:t * 9 + 9])
+# MISPLACED[tile * 9 + pos] is 1 if pos is not the tile's goal position (again 0 for the blank)
+MISPLACED = bytes(0 if t == 0 else int(GOAL_STR[pos] != str(t))
+                  for t in range(9) for pos in range(9))
+
+# pattern database of exact costs to the goal, see pdb(); cached on disk between runs
+PDB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb_8puzzle.bin")
+PDB_SIZE = 362880  # 9!, one entry per arrangement of the tiles (see puzz.perm_rank())
+PDB_UNREACHABLE = 0xFFFF  # entry for boards that cannot reach the goal
+_PDB = None  # loaded on first use
+
+
+def h1(packed):
+    """Misplaced tile count heuristic.
+
+    XORs the packed board against the goal and counts the nonzero 4-bit slots, leaving out the
+    slot the blank occupies.
+
+    Args:
+        packed (int): packed board (see EightPuzzleBoard.packed)
+
+    Returns: the number of tiles that are not in their goal position
+    """
+    x = packed ^ GOAL_PACKED
+    x = (x | (x >> 1) | (x >> 2) | (x >> 3)) & NIBBLE_LOW_BITS
+    # a blank away from home leaves a tile in its goal slot and itself in a differing slot
+    return bin(x).count("1") - ((x >> GOAL_BLANK_SHIFT) & 1)
+
+
+def h2(packed):
+    """Manhattan distance heuristic.
+
+    Args:
+        packed (int): packed board (see EightPuzzleBoard.packed)
+
+    Returns: the sum of the distances of all tiles from their goal positions
+    """
+    return _table_sum(MD, packed)
+
+
+def h3(packed):
+    """Manhattan distance heuristic, weighted by the squared tile numbers.
+
+    Moving tile t costs t**2 and it takes at least its Manhattan distance worth of moves to bring
+    it home, so this is still a lower bound on the remaining path cost.
+
+    Args:
+        packed (int): packed board (see EightPuzzleBoard.packed)
+
+    Returns: the sum over all tiles of the squared tile number times its Manhattan distance
+    """
+    return _table_sum(WEIGHTED_MD, packed)
+
+
+def _table_sum(table, p):
+    """Sum table[tile * 9 + pos] over the tiles of a packed board, one term per slot."""
+    return (table[(p & 0xF) * 9] + table[(p >> 4 & 0xF) * 9 + 1] + table[(p >> 8 & 0xF) * 9 + 2]
+            + table[(p >> 12 & 0xF) * 9 + 3] + table[(p >> 16 & 0xF) * 9 + 4]
+            + table[(p >> 20 & 0xF) * 9 + 5] + table[(p >> 24 & 0xF) * 9 + 6]
+            + table[(p >> 28 & 0xF) * 9 + 7] + table[(p >> 32 & 0xF) * 9 + 8])
+
+
+def pdb(packed):
+    """Pattern database heuristic.
+
+    The database covers every arrangement of the tiles, so this is the exact cost of the cheapest
+    path to the goal rather than an estimate.  It is read from PDB_FILE on first use, and built and
+    saved there if the file is missing (which takes a few seconds).
+
+    Args:
+        packed (int): packed board (see EightPuzzleBoard.packed)
+
+    Returns: the cost of the cheapest path from the board to the goal, or PDB_UNREACHABLE
+    """
+    table = _PDB
+    if table is None:
+        table = load_pdb()
+    return table[puzz.perm_rank(packed)]
+
+
+def load_pdb():
+    """Load the pattern database used by pdb(), building and saving it if needed.
+
+    A file of the wrong size, or one that does not give the goal a cost of 0, is taken to be
+    stale or corrupt and is rebuilt rather than trusted.
+
+    Returns: the database (see build_pdb())
+    """
+    global _PDB
+    table = array.array('H')
+    try:
+        with open(PDB_FILE, 'rb') as f:
+            if os.fstat(f.fileno()).st_size != PDB_SIZE * table.itemsize:
+                raise ValueError("wrong pattern database size")
+            table.fromfile(f, PDB_SIZE)
+        if table[puzz.perm_rank(GOAL_PACKED)] != 0:
+            raise ValueError("corrupt pattern database")
+    except (OSError, EOFError, ValueError):
+        table = build_pdb()
+        save_pdb(table)
+    _PDB = table
+    return table
+
+
+def save_pdb(table):
+    """Save the pattern database to PDB_FILE.
+
+    Several processes may build the database at once (see solver.solve_all()), so it is written
+    to a temporary file first and then renamed over PDB_FILE; readers only ever see a complete
+    file or none at all.
+
+    Args:
+        table (array): the database (see build_pdb())
+    """
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(PDB_FILE), suffix=".tmp")
+    except OSError:
+        return  # the file only saves rebuilding the table next time
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            table.tofile(f)
+        # mkstemp() makes the file private; give it the permissions a plain open() would have
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, PDB_FILE)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def build_pdb():
+    """Compute the cost of the cheapest path to the goal from every board.
+
+    Runs uniform-cost search backwards from the goal until every reachable board has been
+    expanded.  Every move can be undone at the same cost, so the cost of reaching a board from the
+    goal is also the cost of reaching the goal from it.
+
+    Returns: an array of unsigned shorts indexed by puzz.perm_rank(), holding each board's cost to
+        the goal (PDB_UNREACHABLE for boards that cannot reach it)
+    """
+    table = array.array('H', [PDB_UNREACHABLE]) * PDB_SIZE
+    dist = {GOAL_PACKED: 0}
+    frontier = pdqpq.BucketQueue()
+    frontier.add((GOAL_PACKED, GOAL_BLANK_SHIFT // 4), 0)
+    while not frontier.is_empty():
+        (node, blank), cost = frontier.popitem()
+        if cost != dist[node]:
+            continue  # stale entry, the board was reached more cheaply since
+        table[puzz.perm_rank(node)] = cost
+        for move, pos in puzz.ADJ[blank]:
+            tile = (node >> (4 * pos)) & 0xF
+            succ = node ^ ((tile << (4 * pos)) | (tile << (4 * blank)))
+            succ_cost = cost + tile * tile
+            if succ_cost < dist.get(succ, PDB_UNREACHABLE):
+                dist[succ] = succ_cost
+                frontier.add((succ, pos), succ_cost)
+    return table
+
+
+HEURISTICS = {'h1': h1, 'h2': h2, 'h3': h3, 'pdb': pdb}
+
+# h1, h2 and h3 are sums of per-tile terms, TABLES[name][tile * 9 + pos].  A move only changes the
+# term of the tile that moved, so the value for a successor is that of its parent plus
+#     table[tile * 9 + dst] - table[tile * 9 + src]
+# where src and dst are the positions the tile was moved from and to (see puzz.successors_of()).
+TABLES = {'h1': MISPLACED, 'h2': MD, 'h3': WEIGHTED_MD}
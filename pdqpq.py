@@ -1,3 +1,4 @@
+import collections
 import heapq
 import itertools
 
@@ -89,3 +90,70 @@ class FifoQueue(PriorityQueue):
         super().add(task, self.p)
         self.p += 1
 
+
+class BucketQueue:
+    """Bucket priority queue for non-negative integer priorities.
+
+    Tasks are kept in one FIFO deque per priority value, so tasks of equal priority are popped in
+    insertion order.  The priorities that currently have a bucket are kept in a heap, which is
+    only touched when a bucket is created or emptied; searches produce far fewer distinct
+    priorities than tasks, so adding and popping are O(1) most of the time.  Memory grows with
+    the number of distinct priorities in use, not with their magnitude.
+
+    Unlike PriorityQueue, adding a task that is already queued does not replace it; both entries
+    are kept and it is up to the caller to recognize and skip the stale one when it is popped.
+    """
+
+    def __init__(self):
+        self.buckets = {}  # priority -> deque of the tasks with that priority (never empty)
+        self.priorities = []  # heap of the keys of buckets
+        self.size = 0
+
+    def add(self, task, priority):
+        """Add a task.
+
+        Args:
+            task: any python object or primitive type
+            priority: non-negative integer priority (lower numbers are popped first!)
+
+        Raises: ValueError if the priority is negative
+        """
+        bucket = self.buckets.get(priority)
+        if bucket is None:
+            if priority < 0:
+                raise ValueError("negative priority {}".format(priority))
+            bucket = self.buckets[priority] = collections.deque()
+            heapq.heappush(self.priorities, priority)
+        bucket.append(task)
+        self.size += 1
+
+    def peek(self):
+        """Return the highest priority task, priority without removing it."""
+        if not self.size:
+            return None
+        priority = self.priorities[0]
+        return self.buckets[priority][0], priority
+
+    def pop(self):
+        """Remove and return the next priority task. Raise KeyError if empty."""
+        return self.popitem()[0]
+
+    def popitem(self):
+        """Remove and return the next priority task and its priority. Raise KeyError if empty."""
+        if not self.size:
+            raise KeyError('pop from an empty priority queue')
+        priority = self.priorities[0]
+        bucket = self.buckets[priority]
+        task = bucket.popleft()
+        if not bucket:
+            del self.buckets[priority]
+            heapq.heappop(self.priorities)
+        self.size -= 1
+        return task, priority
+
+    def is_empty(self):
+        """Return true if the queue is empty."""
+        return self.size == 0
+
+    def __len__(self):
+        return self.size
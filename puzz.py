@@ -1,4 +1,97 @@
 BLANK_CHAR = '0'
+_DIGITS = "0123456789"
+
+_SUCC_CACHE = {}  # packed board -> tuple of its successors, see successors_of()
+_NIBBLE_LOW_BITS = 0x111111111  # lowest bit of each of the nine 4-bit tile slots
+
+# ADJ[blank] lists the valid moves with the blank at string position blank, as (move, pos) pairs
+# where pos is the position of the tile that slides into the blank.  The moves are always in the
+# order up, down, left, right.
+ADJ = (
+    (("up", 3), ("left", 1)),
+    (("up", 4), ("left", 2), ("right", 0)),
+    (("up", 5), ("right", 1)),
+    (("up", 6), ("down", 0), ("left", 4)),
+    (("up", 7), ("down", 1), ("left", 5), ("right", 3)),
+    (("up", 8), ("down", 2), ("right", 4)),
+    (("down", 3), ("left", 7)),
+    (("down", 4), ("left", 8), ("right", 6)),
+    (("down", 5), ("right", 7)),
+)
+
+
+def successors_of(packed):
+    """Generate all successors of a packed board (see EightPuzzleBoard.packed).
+
+    The successor function is pure and there are only 9!/2 reachable boards, so results are
+    memoized for the lifetime of the process and shared by every search.
+
+    Args:
+        packed (int): packed board
+
+    Returns: a tuple of (move, successor, tile, src, dst) tuples, one per valid move, in the same
+        order as EightPuzzleBoard.successors().  successor is the packed board after the move, tile
+        is the number on the tile that was moved, and src and dst are the positions it was moved
+        from and to (dst being where the blank was).
+    """
+    succs = _SUCC_CACHE.get(packed)
+    if succs is None:
+        # the blank is the only all-zero nibble, so it is the only slot left unset here
+        occupied = (packed | (packed >> 1) | (packed >> 2) | (packed >> 3)) & _NIBBLE_LOW_BITS
+        blank = ((occupied ^ _NIBBLE_LOW_BITS).bit_length() - 1) >> 2
+        succs = []
+        for move, pos in ADJ[blank]:
+            tile = (packed >> (4 * pos)) & 0xF
+            # the blank slot holds 0, so the swap is a subtract and an add
+            succs.append((move, packed - (tile << (4 * pos)) + (tile << (4 * blank)), tile,
+                          pos, blank))
+        succs = _SUCC_CACHE[packed] = tuple(succs)
+    return succs
+
+
+def clear_cache():
+    """Forget all memoized successors (see successors_of())."""
+    _SUCC_CACHE.clear()
+
+
+_FACTORIALS = (40320, 5040, 720, 120, 24, 6, 2, 1, 1)  # (8 - i)! for string position i
+
+
+def perm_rank(packed):
+    """Return the rank of a packed board among all 9! tile arrangements.
+
+    The rank is the board's Lehmer code read as a factorial-base number, so every arrangement gets
+    a distinct index in range(9!), usable as an index into a flat table.
+
+    Args:
+        packed (int): packed board
+
+    Returns: an int between 0 and 9! - 1
+    """
+    rank = 0
+    placed = 0  # bit t is set once tile t has been seen
+    for i in range(9):
+        t = (packed >> (4 * i)) & 0xF
+        # tiles smaller than t that are still to come
+        smaller = t - bin(placed & ((1 << t) - 1)).count("1")
+        rank += smaller * _FACTORIALS[i]
+        placed |= 1 << t
+    return rank
+
+
+def parity(packed):
+    """Return the parity of the number of inversions among the tiles of a packed board.
+
+    No move changes it (a vertical move carries a tile past exactly two others), so boards of
+    different parity can never be reached from each other.
+
+    Args:
+        packed (int): packed board
+
+    Returns: 0 or 1
+    """
+    tiles = [t for t in ((packed >> (4 * i)) & 0xF for i in range(9)) if t]
+    return sum(a > b for i, a in enumerate(tiles) for b in tiles[i + 1:]) & 1
 
 
 class EightPuzzleBoard:
@@ -7,10 +100,12 @@ class EightPuzzleBoard:
     In general, the board positions are set when an object is created and should not be
     manipulated.  The successor functions generate reachable states from the current board.
 
-    The tiles themselves are represented by a list of digits internally, and manipulated
+    The tiles themselves are packed into a single int internally (see packed), and manipulated
     using (x, y) coordinates.
     """
 
+    __slots__ = ('_state', '_pos')
+
     def __init__(self, board_string, mods=None):
         """Constructor for 8-puzzle board.
 
@@ -19,63 +114,63 @@ class EightPuzzleBoard:
             mods: optional list of (x, y, value) tuples that are applied to the board_string
                 immediately after creation (used for generating successors)
         """
-        self._board = list(board_string)
+        self._state = 0
+        for i, c in enumerate(board_string):
+            self._state |= int(c) << (4 * i)
+        self._pos = None
         if mods:
             for x, y, val in mods:
                 self._set_tile(x, y, val)
 
+    @classmethod
+    def from_packed(cls, packed):
+        """Create a board from its packed representation (see packed)."""
+        board = cls.__new__(cls)
+        board._state = packed
+        board._pos = None
+        return board
+
     def get_tile(self, x, y):  # return an individual tile value
-        return self._board[6 - y * 3 + x]
+        return str((self._state >> (4 * (6 - y * 3 + x))) & 0xF)
 
     def _set_tile(self, x, y, val):  # set an individual tile value
-        self._board[6 - y * 3 + x] = val
-
-    def _create_successor(self, delta_x, delta_y):  # create a successor object (or None if invalid)
-        pos = self._board.index(BLANK_CHAR)
-        blank_x = pos % 3
-        blank_y = 2 - int(pos / 3)
-        move_x = blank_x + delta_x
-        move_y = blank_y + delta_y
-        if (move_x < 0) or (move_x > 2) or (move_y < 0) or (move_y > 2):
-            return None
-        else:
-            mods = [(blank_x, blank_y, self.get_tile(move_x, move_y)),
-                    (move_x, move_y, self.get_tile(blank_x, blank_y))]
-            succ = EightPuzzleBoard("".join(self._board), mods)
-            return succ
-
-    def _success_up(self):
-        return self._create_successor(0, -1)
-
-    def _success_down(self):
-        return self._create_successor(0, 1)
-
-    def _success_right(self):
-        return self._create_successor(-1, 0)
-
-    def _success_left(self):
-        return self._create_successor(1, 0)
+        shift = 4 * (6 - y * 3 + x)
+        self._state = (self._state & ~(0xF << shift)) | (int(val) << shift)
+        self._pos = None
+
+    @property
+    def packed(self):
+        """The board packed into an int, 4 bits per tile.
+
+        The tile at string position i occupies bits 4*i to 4*i+3, the blank is stored as 0.
+        """
+        return self._state
+
+    @property
+    def pos(self):
+        """The inverse permutation of the board, as a tuple.
+
+        pos[t] is the string position of tile t, with the blank at pos[0].
+        """
+        if self._pos is None:
+            pos = [0] * 9
+            state = self._state
+            for i in range(9):
+                pos[state & 0xF] = i
+                state >>= 4
+            self._pos = tuple(pos)
+        return self._pos
 
     def successors(self):
         """Generates all successors of this board.
 
+        The moves are looked up with successors_of(), so they are shared with the solvers' cache.
+
         Returns: a dictionary mapping moves to EightPuzzleBoard objects representing the results of
             each valid move move for this board
         """
-        u = self._success_up()
-        d = self._success_down()
-        l = self._success_left()
-        r = self._success_right()
-        succs = {}
-        if u:
-            succs["up"] = u
-        if d: 
-            succs["down"] = d
-        if l: 
-            succs["left"] = l
-        if r:
-            succs["right"] = r
-        return succs
+        return {move: EightPuzzleBoard.from_packed(succ)
+                for move, succ, _, _, _ in successors_of(self._state)}
 
     def get_move(self, successor):
         """Get the move used to get from this state to other state.
@@ -99,29 +194,32 @@ class EightPuzzleBoard:
         """
         if c is None:
             c = BLANK_CHAR
-        pos = self._board.index(c)
+        pos = self.pos[int(c)]
         x = pos % 3
         y = 2 - int(pos/3)
         return x, y
 
     def __str__(self):
-        return "".join(self._board)
+        return "".join([_DIGITS[(self._state >> shift) & 0xF] for shift in range(0, 36, 4)])
 
     def __repr__(self):
-        return "".join(self._board)
+        return str(self)
+
+    def __reduce__(self):  # pickle as the board string, e.g. for multiprocessing
+        return EightPuzzleBoard, (str(self),)
 
     def __hash__(self):
-        return hash("".join(self._board))
+        return hash(self._state)
 
     def __eq__(self, other):
-        return "".join(self._board) == "".join(other._board)
+        return self._state == other._state
         
     def pretty(self):
         """Pretty-print the board.
 
         Returns: a readable three-line representation of the board
         """
-        brd_str = " ".join(self._board).replace(BLANK_CHAR, ".", 1)
+        brd_str = " ".join(str(self)).replace(BLANK_CHAR, ".", 1)
         return "{}\n{}\n{}".format(brd_str[:6], brd_str[6:12], brd_str[12:])
 
 
@@ -1,8 +1,37 @@
+import collections
+import functools
+import math
+import multiprocessing
+import os
 import sys
-import puzz
+import types
+import heuristics
 import pdqpq
+import puzz
+
+GOAL_STATE = heuristics.GOAL_STATE
+
+
+def clear_caches():
+    """Drop the successors memoized across searches.
+
+    The successor cache is module-global on purpose, so that running several flavors on the same
+    puzzle reuses the work of the earlier ones.  Its contents only depend on the boards involved,
+    so clearing it never changes a search result; it is meant for tests and cold-start timings.
+    (Heuristic values need no cache: the solvers derive each successor's value from its parent's.)
+    """
+    puzz.clear_cache()
 
-GOAL_STATE = puzz.EightPuzzleBoard("012345678")
+
+# search strategy -> function creating a solver from the heuristic name and weight of a flavor (see
+# solve_puzzle()); the heuristic itself is looked up once, by the solver's constructor
+SOLVERS = {
+    'bfs': lambda heur, weight: BreadthFirstSolver(),
+    'ucost': lambda heur, weight: UniformCostSolver(),
+    'greedy': lambda heur, weight: GreedySolver(heur),
+    'astar': lambda heur, weight: AstarSolver(heur, weight),
+    'ida': lambda heur, weight: IdaStarSolver(heur),
+}
 
 
 def solve_puzzle(start_state, flavor):
@@ -19,6 +48,12 @@ def solve_puzzle(start_state, flavor):
             'astar-h1' - A* search using a misplaced tile count heuristic
             'astar-h2' - A* search using a Manhattan distance heuristic
             'astar-h3' - A* search using a weighted Manhattan distance heuristic
+            Any A* flavor may carry a '-w<weight>' suffix, e.g. 'astar-h2-w2.5', to run weighted
+            A* with f = g + weight*h (see AstarSolver); the weight must be a finite number >= 1.
+            'astar-pdb' - A* search using the exact costs from a pattern database (the same
+                'pdb' heuristic also works with greedy and ida)
+            'ida-h1', 'ida-h2', 'ida-h3' - IDA* search using the heuristic of the same name (see
+                IdaStarSolver)
     
     Returns: 
         A dictionary containing describing the search performed, containing the following entries:
@@ -34,30 +69,80 @@ def solve_puzzle(start_state, flavor):
 
     """
     if flavor.find('-') > -1:
-        strat, heur = flavor.split('-')
+        strat, heur = flavor.split('-', 1)
     else:
         strat, heur = flavor, None
 
-    if strat == 'bfs':
-        return BreadthFirstSolver().solve(start_state)
-    elif strat == 'ucost':
-        return UniformCostSolver().solve(start_state)
-    elif strat == 'greedy':
-        return GreedySolver(heur).solve(start_state)
-    elif strat == 'astar':
-        return AstarSolver(heur).solve(start_state)
-    else:
+    weight = 1
+    if strat == 'astar' and heur is not None and '-w' in heur:
+        heur, weight = heur.split('-w', 1)
+        try:
+            weight = float(weight)
+            if not math.isfinite(weight) or weight < 1:
+                raise ValueError(weight)
+        except ValueError:
+            raise ValueError("Unknown search flavor '{}'".format(flavor)) from None
+
+    if strat not in SOLVERS:
         raise ValueError("Unknown search flavor '{}'".format(flavor))
+    return SOLVERS[strat](heur, weight).solve(start_state)
+
+
+def solve_all(start_state, flavors, processes=1):
+    """Solve a puzzle with several search flavors.
+
+    By default all searches run one after the other in this process and share the memoized
+    successors (see clear_caches()).  Solvers never modify boards or cached successors, so sharing
+    cannot change any result.  The uninformed flavors go first: they visit the most states, which
+    leaves the successor cache warm for the informed searches that follow.
+
+    With more than one process the flavors are handed to a pool of worker processes instead, one
+    flavor at a time.  The searches are independent, so on a multi-core machine the slowest flavor
+    bounds the total time, but every worker builds its own successor cache.
+
+    Args:
+        start_state (EightPuzzleBoard): the start state for the searches
+        flavors (list): search flavor tags (see solve_puzzle())
+        processes (int): number of worker processes to use
+
+    Returns:
+        A dictionary mapping each flavor to the dictionary returned by solve_puzzle()
+
+    """
+    flavors = sorted(flavors, key=lambda flav: flav not in ('bfs', 'ucost'))
+    processes = min(processes, len(flavors))
+    if processes > 1:
+        for flav in flavors:
+            print("solving puzzle {} with {}".format(start_state, flav))
+        with multiprocessing.Pool(processes) as pool:
+            solved = pool.map(functools.partial(solve_puzzle, start_state), flavors, chunksize=1)
+        return dict(zip(flavors, solved))
+
+    results = {}
+    for flav in flavors:
+        print("solving puzzle {} with {}".format(start_state, flav))
+        results[flav] = solve_puzzle(start_state, flav)
+    return results
 
 
 class BreadthFirstSolver:
-    """Implementation of Breadth-First Search based puzzle solver"""
+    """Implementation of Breadth-First Search based puzzle solver
+
+    The search runs bidirectionally: one breadth-first search grows from the start state and
+    another from the goal state (every move can be undone, so the goal side may use the same
+    successor function), one full ply at a time until the two meet.  Each step advances the side
+    with the smaller frontier.  This expands on the order of 2*b^(d/2) states instead of b^d for a
+    solution of length d.
+
+    States are handled in their packed form (see EightPuzzleBoard.packed) during the search.
+    """
 
     def __init__(self):
         self.goal = GOAL_STATE
-        self.parents = {}  # state -> parent_state
-        self.frontier = pdqpq.FifoQueue()
-        self.explored = set()
+        self.parents = {}  # state -> parent_state, on the start side
+        self.parents_bwd = {}  # state -> next state towards the goal, on the goal side
+        self.frontier = collections.deque()
+        self.frontier_bwd = collections.deque()
         self.frontier_count = 0  # increment when we add something to frontier
         self.expanded_count = 0  # increment when we pull something off frontier and expand
     
@@ -71,46 +156,80 @@ class BreadthFirstSolver:
             A dictionary describing the search from the start state to the goal state.
 
         """
-        self.parents[start_state] = None
-        self.add_to_frontier(start_state)
+        start = start_state.packed
+        goal = self.goal.packed
+        self.parents[start] = None
+        self.add_to_frontier(self.frontier, start)
+
+        if start == goal:  # edge case        
+            self.parents_bwd[start] = None
+            return self.get_results_dict(start)
+
+        # boards of different parity never meet, and the two sides would each have to exhaust
+        # every board they can reach before giving up
+        if puzz.parity(start) != puzz.parity(goal):
+            return self.get_results_dict(None)
+
+        self.parents_bwd[goal] = None
+        self.add_to_frontier(self.frontier_bwd, goal)
+
+        while self.frontier and self.frontier_bwd:
+            # grow whichever side currently has fewer states to expand
+            if len(self.frontier) <= len(self.frontier_bwd):
+                meet = self.expand_ply(self.frontier, self.parents, self.parents_bwd)
+            else:
+                meet = self.expand_ply(self.frontier_bwd, self.parents_bwd, self.parents)
+            if meet is not None:
+                return self.get_results_dict(meet)
 
-        if start_state == self.goal:  # edge case        
-            return self.get_results_dict(start_state)
+        # if we get here, the search failed
+        return self.get_results_dict(None) 
 
-        while not self.frontier.is_empty():
-            node = self.frontier.pop()  # get the next node in the frontier queue
-            succs = self.expand_node(node)
+    def expand_ply(self, frontier, parents, other_parents):
+        """Expand every state of one ply of a frontier.
 
-            for move, succ in succs.items():
-                if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node
+        Successors are checked against the other side's parent tree as they are generated.  The
+        whole ply is always expanded, so that the shortest of the meeting points can be picked.
 
-                    # BFS checks for goal state _before_ adding to frontier
-                    if succ == self.goal:
-                        self.add_to_frontier(succ)
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ)
+        Args:
+            frontier (deque): frontier of the side being expanded
+            parents (dict): parent tree of the side being expanded
+            other_parents (dict): parent tree of the opposite side
 
-        # if we get here, the search failed
-        return self.get_results_dict(None) 
+        Returns:
+            The meeting state giving the shortest path, or None if the two sides have not met
 
-    def add_to_frontier(self, node):
+        """
+        meets = []
+        for _ in range(len(frontier)):
+            node = frontier.popleft()  # get the next node in the frontier queue
+
+            for move, succ, tile, _, _ in self.expand_node(node):
+                if succ not in parents:
+                    parents[succ] = node
+                    self.add_to_frontier(frontier, succ)
+                    if succ in other_parents:
+                        meets.append(succ)
+
+        if not meets:
+            return None
+        return min(meets, key=lambda state: len(self.get_path(state)))
+
+    def add_to_frontier(self, frontier, node):
         """Add state to frontier and increase the frontier count."""
-        self.frontier.add(node)
+        frontier.append(node)
         self.frontier_count += 1
 
     def expand_node(self, node):
         """Get the next state from the frontier and increase the expanded count."""
-        self.explored.add(node)
         self.expanded_count += 1
-        return node.successors()
+        return puzz.successors_of(node)
 
     def get_results_dict(self, state):
         """Construct the output dictionary for solve_puzzle()
         
         Args:
-            state (EightPuzzleBoard): final state in the search tree
+            state (int): packed state where the two searches met
         
         Returns:
             A dictionary describing the search performed (see solve_puzzle())
@@ -119,49 +238,53 @@ class BreadthFirstSolver:
         results = {}
         results['frontier_count'] = self.frontier_count
         results['expanded_count'] = self.expanded_count
-        if state:
-            results['path_cost'] = self.get_cost(state)
+        if state is not None:
             path = self.get_path(state)
+            results['path_cost'] = self.get_cost(path)
             moves = ['start'] + [ path[i-1].get_move(path[i]) for i in range(1, len(path)) ]
             results['path'] = list(zip(moves, path))
         return results
 
     def get_path(self, state):
-        """Return the solution path from the start state of the search to a target.
+        """Return the solution path from the start state to the goal through a meeting state.
         
-        Results are obtained by retracing the path backwards through the parent tree to the start
-        state for the serach at the root.
+        Results are obtained by retracing the path backwards through the start side's parent
+        tree to the start state, then forwards through the goal side's tree to the goal state.
         
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed state reached by both searches
         
         Returns:
             A list of EightPuzzleBoard objects representing the path from the start state to the
-            target state
+            goal state
 
         """
         path = []
-        while state is not None:
-            path.append(state)
-            state = self.parents[state]
+        node = state
+        while node is not None:
+            path.append(node)
+            node = self.parents[node]
         path.reverse()
-        return path
-
-    def get_cost(self, state): 
-        """Calculate the path cost from start state to a target state.
+        node = self.parents_bwd[state]
+        while node is not None:
+            path.append(node)
+            node = self.parents_bwd[node]
+        return [puzz.EightPuzzleBoard.from_packed(node) for node in path]
+
+    def get_cost(self, path): 
+        """Calculate the cost of a path.
         
         Transition costs between states are equal to the square of the number on the tile that 
         was moved. 
 
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            path (list): EightPuzzleBoard objects along the path
         
         Returns:
             Integer indicating the cost of the solution path
 
         """
         cost = 0
-        path = self.get_path(state)
         for i in range(1, len(path)):
             x, y = path[i-1].find(None)  # the most recently moved tile leaves the blank behind
             tile = path[i].get_tile(x, y)        
@@ -170,13 +293,16 @@ class BreadthFirstSolver:
 
 
 class UniformCostSolver:
-    """Implementation of Breadth-First Search based puzzle solver"""
+    """Implementation of Uniform-Cost Search based puzzle solver
+
+    States are handled in their packed form (see EightPuzzleBoard.packed) during the search.
+    """
 
     def __init__(self):
         self.goal = GOAL_STATE
         self.parents = {}  # state -> parent_state
-        self.frontier = pdqpq.PriorityQueue()
-        self.explored = set()
+        self.frontier = pdqpq.BucketQueue()  # stale entries included
+        self.g = {}  # state -> cost of the best known path from the start state
         self.frontier_count = 0  # increment when we add something to frontier
         self.expanded_count = 0  # increment when we pull something off frontier and expand
     
@@ -190,71 +316,77 @@ class UniformCostSolver:
             A dictionary describing the search from the start state to the goal state.
 
         """
-        self.parents[start_state] = None
-        self.add_to_frontier(start_state, 0)
-
-        while not self.frontier.is_empty():
-            node = self.frontier.pop()  # get the next node in the frontier queue
-
-            if node == self.goal:  # edge case        
-                return self.get_results_dict(start_state)
-
-            succs = self.expand_node(node)
-
-            for move, succ in succs.items():
-
-                if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ))
-
-                elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.get_cost(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ,self.get_cost(succ))
-                    else:
-                        self.parents[succ] = old_parent
-                
-# if succ in frontier:
-# store a reference to the current parent
-# change the parent to node
-# check if the cost of the stored reference is > this change
-#      if yes: add succ to the frontier with new cost
-#   otherwise: change the parent back to original reference
-                            
-                # elif (succ in self.frontier) and (self.frontier.get(succ) > self.get_cost(succ)):
-
-                #     self.parents[succ] = node
-                    
-                #     self.frontier.add(succ,self.get_cost(succ))
+        start = start_state.packed
+        goal = self.goal.packed
+        self.parents[start] = None
+        self.g[start] = 0
+        self.add_to_frontier(start, 0)
+        self.frontier_count += 1
+
+        # the loop below runs for every generated state, so look everything up only once
+        frontier = self.frontier
+        parents = self.parents
+        g = self.g
+        g_get = g.get
+        push = frontier.add
+        popitem = frontier.popitem
+        expand_node = self.expand_node
+
+        while frontier.size:
+            node, priority = popitem()  # get the next node in the frontier queue
+            node_g = g[node]
+            # a state is only queued again at a strictly lower cost, so an entry whose priority is
+            # not the state's g is stale and there is no need to keep a closed set
+            if priority != node_g:
+                continue
+
+            # the goal test happens on removal, where g is known to be minimal
+            if node == goal:
+                return self.get_results_dict(node)
+
+            parent = parents[node]
+            for move, succ, tile, _, _ in expand_node(node):
+                if succ == parent:
+                    continue  # undoing the last move only leads back to a cheaper state
+                # a single probe of g serves as the closed set too: step costs are positive, so an
+                # expanded state's g is final and can never be beaten
+                new_g = node_g + tile * tile
+                succ_g = g_get(succ)
+                if succ_g is None:
+                    self.frontier_count += 1
+                elif new_g >= succ_g:
+                    continue
+                parents[succ] = node
+                g[succ] = new_g
+                push(succ, new_g)
+
+                # step costs are positive, so once nothing cheaper than the goal is left on the
+                # frontier its cost is final and there is no need to wait for it to be popped
+                if succ == goal and frontier.peek()[1] >= new_g:
+                    return self.get_results_dict(succ)
 
         # if we get here, the search failed
         return self.get_results_dict(None) 
 
     def add_to_frontier(self, node, priority):
-        """Add state to frontier and increase the frontier count."""
+        """Add state to the frontier.
+
+        A state that is already on the frontier is added again instead of being re-prioritized
+        in place; its stale entry is skipped once it surfaces, because by then the state has been
+        expanded.
+        """
         self.frontier.add(node, priority)
-        self.frontier_count += 1
 
     def expand_node(self, node):
         """Get the next state from the frontier and increase the expanded count."""
-        self.explored.add(node)
         self.expanded_count += 1
-        return node.successors()
+        return puzz.successors_of(node)
 
     def get_results_dict(self, state):
         """Construct the output dictionary for solve_puzzle()
         
         Args:
-            state (EightPuzzleBoard): final state in the search tree
+            state (int): packed final state in the search tree
         
         Returns:
             A dictionary describing the search performed (see solve_puzzle())
@@ -263,7 +395,7 @@ class UniformCostSolver:
         results = {}
         results['frontier_count'] = self.frontier_count
         results['expanded_count'] = self.expanded_count
-        if state:
+        if state is not None:
             results['path_cost'] = self.get_cost(state)
             path = self.get_path(state)
             moves = ['start'] + [ path[i-1].get_move(path[i]) for i in range(1, len(path)) ]
@@ -274,170 +406,186 @@ class UniformCostSolver:
         """Return the solution path from the start state of the search to a target.
         
         Results are obtained by retracing the path backwards through the parent tree to the start
-        state for the serach at the root.
+        state for the serach at the root: once to measure its length, then again to fill in a list
+        of that size from the end.
         
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed target state in the search tree
         
         Returns:
             A list of EightPuzzleBoard objects representing the path from the start state to the
             target state
 
         """
-        path = []
-        while state is not None:
-            path.append(state)
-            state = self.parents[state]
-        path.reverse()
+        parents = self.parents
+        length = 0
+        node = state
+        while node is not None:
+            length += 1
+            node = parents[node]
+
+        # fill in the path from the far end, so it is built in place and in order
+        path = [None] * length
+        for i in range(length - 1, -1, -1):
+            path[i] = puzz.EightPuzzleBoard.from_packed(state)
+            state = parents[state]
         return path
 
     def get_cost(self, state): 
-        """Calculate the path cost from start state to a target state.
+        """Return the path cost from start state to a target state.
         
         Transition costs between states are equal to the square of the number on the tile that 
-        was moved. 
+        was moved.  They are accumulated into self.g as states are generated, so no path needs to
+        be retraced here.
 
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed target state in the search tree
         
         Returns:
             Integer indicating the cost of the solution path
 
         """
-        cost = 0
-        path = self.get_path(state)
-        #print(path)
-        for i in range(1, len(path)):
-            x, y = path[i-1].find(None)  # the most recently moved tile leaves the blank behind
-            tile = path[i].get_tile(x, y)        
-            cost += int(tile)**2
-        return cost
+        return self.g[state]
 
 
 class GreedySolver:
-    """Implementation of Breadth-First Search based puzzle solver"""
+    """Implementation of Greedy Best-First Search based puzzle solver
+
+    The solve() method is generated for the heuristic in use (see _solve_for()).  States are
+    handled in their packed form (see EightPuzzleBoard.packed) during the search.
+    """
 
     def __init__(self,heur):
         self.goal = GOAL_STATE
         self.parents = {}  # state -> parent_state
-        self.frontier = pdqpq.PriorityQueue()
-        self.explored = set()
+        self.frontier = pdqpq.BucketQueue()
+        self.g = {}  # state -> cost of the best known path from the start state
         self.frontier_count = 0  # increment when we add something to frontier
         self.expanded_count = 0  # increment when we pull something off frontier and expand
         self.heur = heur
-    
-    def solve(self, start_state):
-        """Carry out the search for a solution path to the goal state.
+        if heur not in heuristics.HEURISTICS:
+            raise ValueError("Unknown heuristic '{}'".format(heur))
+        self.solve = types.MethodType(_solve_for('greedy', heur), self)
+
+    def add_to_frontier(self, node, priority):
+        """Add state to the frontier."""
+        self.frontier.add(node, priority)
+
+    def expand_node(self, node):
+        """Get the next state from the frontier and increase the expanded count."""
+        self.expanded_count += 1
+        return puzz.successors_of(node)
+
+    def get_results_dict(self, state):
+        """Construct the output dictionary for solve_puzzle()
         
         Args:
-            start_state (EightPuzzleBoard): start state for the search 
+            state (int): packed final state in the search tree
         
         Returns:
-            A dictionary describing the search from the start state to the goal state.
+            A dictionary describing the search performed (see solve_puzzle())
+
+        """
+        results = {}
+        results['frontier_count'] = self.frontier_count
+        results['expanded_count'] = self.expanded_count
+        if state is not None:
+            results['path_cost'] = self.get_cost(state)
+            path = self.get_path(state)
+            moves = ['start'] + [ path[i-1].get_move(path[i]) for i in range(1, len(path)) ]
+            results['path'] = list(zip(moves, path))
+        return results
+
+    def get_path(self, state):
+        """Return the solution path from the start state of the search to a target.
+        
+        Results are obtained by retracing the path backwards through the parent tree to the start
+        state for the serach at the root: once to measure its length, then again to fill in a list
+        of that size from the end.
+        
+        Args:
+            state (int): packed target state in the search tree
+        
+        Returns:
+            A list of EightPuzzleBoard objects representing the path from the start state to the
+            target state
 
         """
+        parents = self.parents
+        length = 0
+        node = state
+        while node is not None:
+            length += 1
+            node = parents[node]
+
+        # fill in the path from the far end, so it is built in place and in order
+        path = [None] * length
+        for i in range(length - 1, -1, -1):
+            path[i] = puzz.EightPuzzleBoard.from_packed(state)
+            state = parents[state]
+        return path
 
-        self.parents[start_state] = None
-        self.add_to_frontier(start_state, 0)
-
-        while not self.frontier.is_empty():
-            node = self.frontier.pop()  # get the next node in the frontier queue
-
-            if node == self.goal:  # edge case        
-                return self.get_results_dict(start_state)
-
-            succs = self.expand_node(node)
-
-            if (self.heur == 'h1'):
-                for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h1(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h1(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.h1(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.h1(succ))
-                    else:
-                        self.parents[succ] = old_parent            
-            elif (self.heur == 'h2'):
-                 for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h2(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h2(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.h2(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.h2(succ))
-                    else:
-                        self.parents[succ] = old_parent
-            elif (self.heur == 'h3'):
-                for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h3(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h3(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.h3(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.h3(succ))
-                    else:
-                        self.parents[succ] = old_parent
-
-                # elif (succ in self.frontier) and (self.frontier.get(succ) > self.h3(succ)):
-                #     self.frontier.remove(succ)
-                #     self.frontier.add(succ,self.h3(succ))
+    def get_cost(self, state): 
+        """Return the path cost from start state to a target state.
+        
+        Transition costs between states are equal to the square of the number on the tile that 
+        was moved.  They are accumulated into self.g as states are generated, so no path needs to
+        be retraced here.
 
-        # if we get here, the search failed
-        return self.get_results_dict(None) 
+        Args:
+            state (int): packed target state in the search tree
+        
+        Returns:
+            Integer indicating the cost of the solution path
+
+        """
+        return self.g[state]
+
+
+class AstarSolver:
+    """Implementation of A* Search based puzzle solver
 
+    With a weight w other than 1 this becomes weighted A*, ordering the frontier by g + w*h.  A
+    weight above 1 gives up the guarantee of an optimal path (the cost found is at most w times
+    the optimum) in exchange for expanding far fewer states.  The frontier is a bucket queue keyed
+    on integer priorities, so w*h is rounded down.
+
+    States are handled in their packed form (see EightPuzzleBoard.packed) during the search.
+    """
+
+    def __init__(self, heur, weight=1):
+        self.goal = GOAL_STATE
+        self.parents = {}  # state -> parent_state
+        self.frontier = pdqpq.BucketQueue()  # stale entries included
+        self.explored = set()  # only kept by weighted A*, see _ASTAR_CLOSED_CHECK
+        self.g = {}  # state -> cost of the best known path from the start state
+        self.frontier_count = 0  # increment when we add something to frontier
+        self.expanded_count = 0  # increment when we pull something off frontier and expand
+        self.heur = heur
+        self.weight = weight
+        if heur not in heuristics.HEURISTICS:
+            raise ValueError("Unknown heuristic '{}'".format(heur))
+        self.solve = types.MethodType(_solve_for('astar', heur, weight), self)
+    
     def add_to_frontier(self, node, priority):
-        """Add state to frontier and increase the frontier count."""
+        """Add state to the frontier.
+
+        A state that is already on the frontier is added again instead of being re-prioritized
+        in place; its stale entry is skipped once it surfaces, because by then the state has been
+        expanded.
+        """
         self.frontier.add(node, priority)
-        self.frontier_count += 1
 
     def expand_node(self, node):
         """Get the next state from the frontier and increase the expanded count."""
-        self.explored.add(node)
         self.expanded_count += 1
-        return node.successors()
+        return puzz.successors_of(node)
 
     def get_results_dict(self, state):
         """Construct the output dictionary for solve_puzzle()
         
         Args:
-            state (EightPuzzleBoard): final state in the search tree
+            state (int): packed final state in the search tree
         
         Returns:
             A dictionary describing the search performed (see solve_puzzle())
@@ -446,7 +594,7 @@ class GreedySolver:
         results = {}
         results['frontier_count'] = self.frontier_count
         results['expanded_count'] = self.expanded_count
-        if state:
+        if state is not None:
             results['path_cost'] = self.get_cost(state)
             path = self.get_path(state)
             moves = ['start'] + [ path[i-1].get_move(path[i]) for i in range(1, len(path)) ]
@@ -457,91 +605,256 @@ class GreedySolver:
         """Return the solution path from the start state of the search to a target.
         
         Results are obtained by retracing the path backwards through the parent tree to the start
-        state for the serach at the root.
+        state for the serach at the root: once to measure its length, then again to fill in a list
+        of that size from the end.
         
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed target state in the search tree
         
         Returns:
             A list of EightPuzzleBoard objects representing the path from the start state to the
             target state
 
         """
-        path = []
-        while state is not None:
-            path.append(state)
-            state = self.parents[state]
-        path.reverse()
+        parents = self.parents
+        length = 0
+        node = state
+        while node is not None:
+            length += 1
+            node = parents[node]
+
+        # fill in the path from the far end, so it is built in place and in order
+        path = [None] * length
+        for i in range(length - 1, -1, -1):
+            path[i] = puzz.EightPuzzleBoard.from_packed(state)
+            state = parents[state]
         return path
 
     def get_cost(self, state): 
-        """Calculate the path cost from start state to a target state.
+        """Return the path cost from start state to a target state.
         
         Transition costs between states are equal to the square of the number on the tile that 
-        was moved. 
+        was moved.  They are accumulated into self.g as states are generated, so no path needs to
+        be retraced here.
 
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed target state in the search tree
         
         Returns:
             Integer indicating the cost of the solution path
 
         """
-        cost = 0
-        path = self.get_path(state)
-        for i in range(1, len(path)):
-            x, y = path[i-1].find(None)  # the most recently moved tile leaves the blank behind
-            tile = path[i].get_tile(x, y)        
-            cost += int(tile)**2
-        return cost
+        return self.g[state]
 
-    def h1(self, state):
-        cost = 0
-        path = self.get_path(state)
-        
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                cost += 1
-        
-        return cost
 
-    def h2(self, state):
-        cost = 0
-        path = self.get_path(state)
+# Sources of the solve() methods of the informed solvers.  A copy is compiled for every strategy,
+# heuristic and weight combination in use (see _solve_for()), with the heuristic and the weight
+# folded into the successor loop.  Heuristics with a per-tile table are only evaluated in full for
+# the start state; every successor's value is derived from its parent's (see heuristics.TABLES).
+# Everything the loops touch is bound to a local first.
+_ASTAR_SOLVE_TEMPLATE = '''\
+def solve(self, start_state):
+    """Carry out the search for a solution path to the goal state.
 
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                x,y = path[len(path)-1].find(str(i))
-                a,b = self.goal.find(str(i))
-                cost += (abs(a-x) + abs(b-y))
-        return cost
+    Args:
+        start_state (EightPuzzleBoard): start state for the search
 
-    def h3(self, state):
-        cost = 0
-        path = self.get_path(state)
+    Returns:
+        A dictionary describing the search from the start state to the goal state.
+
+    """
+    start = start_state.packed
+    goal = self.goal.packed
+    h = {{start: heuristics.HEURISTICS['{heur}'](start)}}  # state -> heuristic value
+    self.parents[start] = None
+    self.g[start] = 0
+    self.add_to_frontier(start, {start_priority})
+    self.frontier_count += 1
+
+    frontier = self.frontier
+    explored = self.explored
+    parents = self.parents
+    g = self.g
+    g_get = g.get
+    push = frontier.add
+    popitem = frontier.popitem
+    expand_node = self.expand_node
+    {heuristic_setup}
+
+    while frontier.size:
+        node, priority = popitem()  # get the next node in the frontier queue
+        node_g = g[node]
+        node_h = h[node]
+        # a state is only queued again at a strictly lower cost, so an entry whose priority does
+        # not match the state's g is stale
+        if priority != {node_priority}:
+            continue
+
+        # the goal test happens on removal, where g is known to be minimal
+        if node == goal:
+            return self.get_results_dict(node)
+{mark_closed}
+        parent = parents[node]
+        for move, succ, tile, src, dst in expand_node(node):
+            if succ == parent:
+                continue  # undoing the last move only leads back to a cheaper state
+{closed_check}            new_g = node_g + tile * tile
+            succ_g = g_get(succ)
+            if succ_g is None:
+                self.frontier_count += 1
+            elif new_g >= succ_g:
+                continue
+            parents[succ] = node
+            g[succ] = new_g
+            hv = h[succ] = {succ_heuristic}
+            push(succ, {succ_priority})
+
+    # if we get here, the search failed
+    return self.get_results_dict(None)
+'''
+
+_GREEDY_SOLVE_TEMPLATE = '''\
+def solve(self, start_state):
+    """Carry out the search for a solution path to the goal state.
 
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                x,y = path[len(path)-1].find(str(i))
-                a,b = self.goal.find(str(i))
-                tile = path[len(path)-1].get_tile(x, y) 
-                cost += int(tile)**2*(abs(a-x) + abs(b-y))
+    Args:
+        start_state (EightPuzzleBoard): start state for the search
 
-        return cost
+    Returns:
+        A dictionary describing the search from the start state to the goal state.
 
+    """
+    start = start_state.packed
+    goal = self.goal.packed
+    h = {{start: heuristics.HEURISTICS['{heur}'](start)}}  # state -> heuristic value
+    self.parents[start] = None
+    self.g[start] = 0
+    self.add_to_frontier(start, 0)
+    self.frontier_count += 1
+
+    frontier = self.frontier
+    parents = self.parents
+    g = self.g
+    push = frontier.add
+    pop = frontier.pop
+    expand_node = self.expand_node
+    {heuristic_setup}
+
+    while frontier.size:
+        node = pop()  # get the next node in the frontier queue
+
+        if node == goal:  # edge case
+            return self.get_results_dict(node)
+
+        node_g = g[node]
+        node_h = h[node]
+
+        for move, succ, tile, src, dst in expand_node(node):
+            # the priority only depends on the state itself, so a state that has been seen
+            # before is never re-prioritized and keeps its original parent
+            if succ not in g:
+                parents[succ] = node
+                g[succ] = node_g + tile * tile
+                hv = h[succ] = {succ_heuristic}
+                push(succ, hv)
+                self.frontier_count += 1
+
+                if succ == goal:
+                    return self.get_results_dict(succ)
+
+    # if we get here, the search failed
+    return self.get_results_dict(None)
+'''
+
+_SOLVE_TEMPLATES = {'astar': _ASTAR_SOLVE_TEMPLATE, 'greedy': _GREEDY_SOLVE_TEMPLATE}
+
+# With a weight of 1 all heuristics are consistent, so an expanded state's g is final and the g
+# probe in the successor loop is enough to reject it.  An inflated heuristic is not consistent;
+# weighted A* does not reopen expanded states, so it has to keep a closed set and check it.
+_ASTAR_MARK_CLOSED = """\
+        explored.add(node)
+"""
+_ASTAR_CLOSED_CHECK = """\
+            if succ in explored:
+                continue
+"""
+
+_solves = {}  # (strategy, heur, weight) -> compiled solve function
+
+
+def _solve_for(strategy, heur, weight=1):
+    """Return the solve function specialized for a strategy, heuristic and weight.
 
-class AstarSolver:
-    """Implementation of Breadth-First Search based puzzle solver"""
+    Args:
+        strategy (str): 'astar' or 'greedy'
+        heur (str): heuristic name, one of the keys of heuristics.HEURISTICS
+        weight (float): weight of the heuristic in the A* priority (1 for plain A*)
 
-    def __init__(self,heur):
+    Returns:
+        A function to be bound to an AstarSolver or GreedySolver instance as its solve() method
+
+    """
+    key = (strategy, heur, weight)
+    if key not in _solves:
+        if weight == 1:
+            priority = "{} + {}"
+        else:
+            priority = "{} + int(" + repr(weight) + " * {})"
+        if heur in heuristics.TABLES:
+            heuristic_setup = "table = heuristics.TABLES[{!r}]".format(heur)
+            succ_heuristic = "node_h + table[tile * 9 + dst] - table[tile * 9 + src]"
+        else:
+            heuristic_setup = "h_fn = heuristics.HEURISTICS[{!r}]".format(heur)
+            succ_heuristic = "h_fn(succ)"
+        src = _SOLVE_TEMPLATES[strategy].format(
+            heur=heur,
+            heuristic_setup=heuristic_setup,
+            succ_heuristic=succ_heuristic,
+            mark_closed="" if weight == 1 else _ASTAR_MARK_CLOSED,
+            closed_check="" if weight == 1 else _ASTAR_CLOSED_CHECK,
+            start_priority=priority.format("0", "h[start]"),
+            node_priority=priority.format("node_g", "node_h"),
+            succ_priority=priority.format("new_g", "hv"))
+        namespace = {'heuristics': heuristics}
+        exec(compile(src, "<{}-{}-w{}>".format(strategy, heur, weight), "exec"), namespace)
+        _solves[key] = namespace['solve']
+    return _solves[key]
+
+
+class IdaStarSolver:
+    """Implementation of IDA* (iterative deepening A*) based puzzle solver
+
+    Each round is a depth-first search that cuts off every path whose f = g + h exceeds a bound,
+    so only the current path is held in memory instead of an open list.  With squared tile costs
+    f takes many distinct values, and raising the bound to just the next one would take hundreds
+    of rounds.  Instead the f values cut off in a round are counted and the bound is raised far
+    enough to expand about twice as many states in the next round.  That can overshoot the optimal
+    cost, so once a solution is found the round carries on with the bound lowered below its cost,
+    and the last solution found is the cheapest.
+
+    Nothing is remembered between rounds or across branches, so states are visited many times
+    over; frontier_count and expanded_count count every visit.  This only pays off with a
+    heuristic close to the true cost (h3).  With h1 or h2 a hard puzzle takes minutes to hours.
+
+    States are handled in their packed form (see EightPuzzleBoard.packed) during the search.
+    """
+
+    def __init__(self, heur):
         self.goal = GOAL_STATE
-        self.parents = {}  # state -> parent_state
-        self.frontier = pdqpq.PriorityQueue()
-        self.explored = set()
+        self.path = []  # packed states from the start state to the state being searched
+        self.best_path = None  # cheapest solution found so far, as a list of packed states
+        self.best_cost = None
+        self.bound = 0  # paths with a higher f are cut off
+        self.pruned = {}  # f -> number of paths cut off at that f in the current round
         self.frontier_count = 0  # increment when we add something to frontier
         self.expanded_count = 0  # increment when we pull something off frontier and expand
         self.heur = heur
-    
+        try:
+            self._h = heuristics.HEURISTICS[heur]
+        except KeyError:
+            raise ValueError("Unknown heuristic '{}'".format(heur)) from None
+        self._table = heuristics.TABLES.get(heur)  # None if h has to be evaluated in full
+
     def solve(self, start_state):
         """Carry out the search for a solution path to the goal state.
         
@@ -552,108 +865,102 @@ class AstarSolver:
             A dictionary describing the search from the start state to the goal state.
 
         """
+        start = start_state.packed
+        goal = self.goal.packed
+        self.path.append(start)
+        self.frontier_count += 1
 
-        self.parents[start_state] = None
-        self.add_to_frontier(start_state, 0)
-
-        while not self.frontier.is_empty():
-            
-            node = self.frontier.pop()  # get the next node in the frontier queue
-
-            if node == self.goal:  # edge case        
-                return self.get_results_dict(start_state)
-
-            succs = self.expand_node(node)
-
-            if (self.heur == 'h1'):
-                for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h1(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h1(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.get_cost(succ)+self.h1(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.get_cost(succ)+self.h1(succ))
-                    else:
-                        self.parents[succ] = old_parent      
-            elif (self.heur == 'h2'):
-                 for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h2(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h2(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.get_cost(succ)+self.h2(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.get_cost(succ)+self.h2(succ))
-                    else:
-                        self.parents[succ] = old_parent
-            elif (self.heur == 'h3'):
-                for move, succ in succs.items():
-
-                  if (succ not in self.frontier) and (succ not in self.explored):
-                    self.parents[succ] = node 
-
-                    if succ == self.goal:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h3(succ))
-                        return self.get_results_dict(succ)
-                    else:
-                        self.add_to_frontier(succ, self.get_cost(succ)+self.h3(succ))
-                
-                  elif (succ in self.frontier):
-                    old_parent = self.parents[succ]
-                    old_priority = self.frontier.get(succ)
-                    self.parents[succ] = node
-                    new_priority = self.get_cost(succ)+self.h3(succ)
-
-                    if(old_priority > new_priority):
-                        self.frontier.add(succ, self.get_cost(succ)+self.h3(succ))
-                    else:
-                        self.parents[succ] = old_parent
-
-                # elif (succ in self.frontier) and (self.frontier.get(succ) > self.get_cost(succ)+self.h1(succ)):
-                #     self.frontier.remove(succ)
-                #     self.frontier.add(succ,self.get_cost(succ)+self.h1(succ))
+        # the depth-first search keeps no record of visited states, so it could never tell that
+        # the goal is out of reach
+        if puzz.parity(start) != puzz.parity(goal):
+            return self.get_results_dict(None)
+
+        start_h = self._h(start)
+        self.bound = start_h
+        while True:
+            expanded_before = self.expanded_count
+            self.pruned.clear()
+            self.search(start, start_state.pos[0], None, 0, start_h)
+            if self.best_path is not None:
+                return self.get_results_dict(goal)
+            if not self.pruned:
+                break
+            self.bound = self.next_bound(2 * (self.expanded_count - expanded_before))
 
         # if we get here, the search failed
-        return self.get_results_dict(None) 
+        return self.get_results_dict(None)
 
-    def add_to_frontier(self, node, priority):
-        """Add state to frontier and increase the frontier count."""
-        self.frontier.add(node, priority)
-        self.frontier_count += 1
+    def search(self, node, blank, prev_blank, node_g, node_h):
+        """Search depth-first below a state, within the current bound.
+
+        Successors are made by swapping nibbles of the packed state directly (the shared
+        successor cache would grow with every state visited, which is what IDA* is meant to
+        avoid).
+
+        Args:
+            node (int): packed state at the end of self.path
+            blank (int): position of the blank in node
+            prev_blank (int): position of the blank in the state before node on the path (None at
+                the start state)
+            node_g (int): cost of the path to node
+            node_h (int): heuristic value of node
+
+        """
+        f = node_g + node_h
+        if f > self.bound:
+            self.pruned[f] = self.pruned.get(f, 0) + 1
+            return
+
+        if node == self.goal.packed:
+            # only look for cheaper solutions from here on
+            self.best_path = list(self.path)
+            self.best_cost = node_g
+            self.bound = node_g - 1
+            return
 
-    def expand_node(self, node):
-        """Get the next state from the frontier and increase the expanded count."""
-        self.explored.add(node)
         self.expanded_count += 1
-        return node.successors()
+        table = self._table
+        for move, pos in puzz.ADJ[blank]:
+            if pos == prev_blank:
+                continue  # undoing the last move can never be part of a cheapest path
+            tile = (node >> (4 * pos)) & 0xF
+            # XORing the tile into both slots moves it into the blank, and doing it again moves
+            # it back, so one state is carried through the whole loop
+            swap = (tile << (4 * pos)) | (tile << (4 * blank))
+            node ^= swap
+            self.frontier_count += 1
+            self.path.append(node)
+            if table is None:
+                succ_h = self._h(node)
+            else:
+                succ_h = node_h + table[tile * 9 + blank] - table[tile * 9 + pos]
+            self.search(node, pos, blank, node_g + tile * tile, succ_h)
+            self.path.pop()
+            node ^= swap
+
+    def next_bound(self, target):
+        """Return the bound for the next round.
+
+        Args:
+            target (int): number of states the next round should expand, roughly
+
+        Returns:
+            The lowest f at or below which at least target paths were cut off in this round (or
+            the highest f cut off, if there were fewer)
+
+        """
+        count = 0
+        for f in sorted(self.pruned):
+            count += self.pruned[f]
+            if count >= target:
+                break
+        return f
 
     def get_results_dict(self, state):
         """Construct the output dictionary for solve_puzzle()
         
         Args:
-            state (EightPuzzleBoard): final state in the search tree
+            state (int): packed goal state if a solution was found, None otherwise
         
         Returns:
             A dictionary describing the search performed (see solve_puzzle())
@@ -662,7 +969,7 @@ class AstarSolver:
         results = {}
         results['frontier_count'] = self.frontier_count
         results['expanded_count'] = self.expanded_count
-        if state:
+        if state is not None:
             results['path_cost'] = self.get_cost(state)
             path = self.get_path(state)
             moves = ['start'] + [ path[i-1].get_move(path[i]) for i in range(1, len(path)) ]
@@ -670,105 +977,34 @@ class AstarSolver:
         return results
 
     def get_path(self, state):
-        """Return the solution path from the start state of the search to a target.
-        
-        Results are obtained by retracing the path backwards through the parent tree to the start
-        state for the serach at the root.
+        """Return the cheapest solution path found.
         
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed goal state
         
         Returns:
             A list of EightPuzzleBoard objects representing the path from the start state to the
-            target state
+            goal state
 
         """
-        path = []
-        while state is not None:
-            path.append(state)
-            state = self.parents[state]
-        path.reverse()
-        return path
+        return [puzz.EightPuzzleBoard.from_packed(node) for node in self.best_path]
 
     def get_cost(self, state): 
-        """Calculate the path cost from start state to a target state.
-        
-        Transition costs between states are equal to the square of the number on the tile that 
-        was moved. 
+        """Return the cost of the cheapest solution path found.
 
         Args:
-            state (EightPuzzleBoard): target state in the search tree
+            state (int): packed goal state
         
         Returns:
             Integer indicating the cost of the solution path
 
         """
-        cost = 0
-        path = self.get_path(state)
-        for i in range(1, len(path)):
-            x, y = path[i-1].find(None)  # the most recently moved tile leaves the blank behind
-            tile = path[i].get_tile(x, y)        
-            cost += int(tile)**2
-        return cost
-
-    
-    def h1(self, state):
-        cost = 0
-        path = self.get_path(state)
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                cost += 1
-        
-        return cost
+        return self.best_cost
 
-    def h2(self, state):
-        cost = 0
-        path = self.get_path(state)
-        #print(path)
-        #print(path[len(path)-1].pretty())
-        # print(path[len(path)-1].find('1'))
-        # print(self.goal.find('1'))
-        #print(self.goal.pretty())
-
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                x,y = path[len(path)-1].find(str(i))
-                a,b = self.goal.find(str(i))
-                cost += (abs(a-x) + abs(b-y))
-        
-        return cost
 
-    # def h3(self, state):
-    #     costList = []
-    #     paths = self.get_path(state)
-    #     print(paths)
-    #     # print(path[len(path)-1].pretty())
-
-    #     for path in paths:
-    #         cost = 0
-    #         for i in range(1,8):
-    #             if (self.goal.__str__()[i]!=path.__str__()[i]):
-    #                 # print(path.__str__()[i])
-    #                 x,y = path.find(str(i))
-    #                 a,b = self.goal.find(str(i))
-    #                 tile = path.get_tile(x, y) 
-    #             cost += int(tile)*int(tile)*(abs(a-x) + abs(b-y))
-    #         costList.append(cost)
-    #     # print(costList)
-
-    #     return min(costList)
-    def h3(self, state):
-        cost = 0
-        path = self.get_path(state)
-
-        for i in range(1,9):
-            if (self.goal.__str__()[i]!=path[len(path)-1].__str__()[i]):
-                x,y = path[len(path)-1].find(str(i))
-                a,b = self.goal.find(str(i))
-                tile = path[len(path)-1].get_tile(x, y) 
-                cost += int(tile)**2*(abs(a-x) + abs(b-y))
-
-        return cost
+# heuristics close enough to the true cost for IDA* to finish quickly (see IdaStarSolver); --ida
+# leaves A* flavors using any other heuristic alone
+IDA_HEURISTICS = ('h3', 'pdb')
 
 
 def print_table(flav__results, include_path=False):
@@ -795,17 +1031,18 @@ def print_table(flav__results, include_path=False):
     ]
     if include_path:
         rows.append("path")
-        longest_path = max([ len(res['path']) for _, res in result_tups if 'path' in res ] + [0])
+        paths = [res.get('path', ()) for _, res in result_tups]
+        longest_path = max(map(len, paths), default=0)
         print("longest", longest_path)
         for i in range(longest_path):
-            row = "        "
-            for _, res in result_tups:
-                if len(res.get('path', [])) > i:
-                    move, state = res['path'][i]
-                    row += " " + move[0] + " " + str(state)
+            cells = []
+            for path in paths:
+                if len(path) > i:
+                    move, state = path[i]
+                    cells.append(" {} {}".format(move[0], state))
                 else:
-                    row += " "*12
-            rows.append(row)
+                    cells.append(" "*12)
+            rows.append("        " + "".join(cells))
     print("\n" + "\n".join(rows), "\n")
 
 
@@ -829,18 +1066,28 @@ def get_test_puzzles():
 if __name__ == '__main__':
 
     # parse the command line args
-    start = puzz.EightPuzzleBoard(sys.argv[1])
-    if sys.argv[2] == 'all':
+    args = sys.argv[1:]
+    ida = '--ida' in args  # run the A* flavors with IDA_HEURISTICS as IDA* instead
+    if ida:
+        args.remove('--ida')
+    processes = os.cpu_count() or 1  # run the flavors in parallel on all cores
+    if '--jobs' in args:
+        i = args.index('--jobs')
+        processes = int(args[i + 1])
+        del args[i:i + 2]
+    start = puzz.EightPuzzleBoard(args[0])
+    if args[1] == 'all':
         flavors = ['bfs', 'ucost', 'greedy-h1', 'greedy-h2', 
                    'greedy-h3', 'astar-h1', 'astar-h2', 'astar-h3']
     else:
-        flavors = sys.argv[2:]
+        flavors = args[1:]
+    if ida:
+        flavors = ['ida-' + flav[len('astar-'):]
+                   if flav.startswith('astar-') and flav[len('astar-'):] in IDA_HEURISTICS else flav
+                   for flav in flavors]
 
     # run the search(es)
-    results = {}
-    for flav in flavors:
-        print("solving puzzle {} with {}".format(start, flav))
-        results[flav] = solve_puzzle(start, flav)
+    results = solve_all(start, flavors, processes)
 
     print_table(results, include_path=False)  # change to True to see the paths!
 